@@ -1,3 +1,4 @@
+from typing import Callable, Union
 import numpy as np
 import pandas as pd
 from sklearn.metrics import confusion_matrix
@@ -8,189 +9,242 @@ from fairlearn.metrics import MetricFrame
 from sklearn.metrics import precision_score
 from sklearn.metrics import recall_score
 from sklearn.metrics import roc_auc_score
+from scipy.linalg import solve_triangular
 
 
-def _get_groups(data, label_name, positive_label, group_condition):
-    query = "&".join([str(k) + "==" + str(v) for k, v in group_condition.items()])
-    label_query = label_name + "==" + str(positive_label)
-    unpriv_group = data.query(query)
-    unpriv_group_pos = data.query(query + "&" + label_query)
-    priv_group = data.query("~(" + query + ")")
-    priv_group_pos = data.query("~(" + query + ")&" + label_query)
-    return unpriv_group, unpriv_group_pos, priv_group, priv_group_pos
+def _build_mask_fn(group_condition):
+    """
+    Builds a function computing the group mask of a DataFrame. It can be
+    passed as group_condition to the metrics below instead of the dictionary,
+    so that a metric suite prepares the condition only once.
+    Args:
+        group_condition (dict): Dictionary specifying the group condition.
+    Returns:
+        callable: Function mapping a DataFrame to a boolean mask of the group.
+    """
+    conditions = tuple(group_condition.items())
 
+    def mask_fn(data):
+        mask = np.ones(len(data), dtype=bool)
+        for k, v in conditions:
+            mask &= data[k].to_numpy() == v
+        return mask
 
-def _compute_probs(data_pred, label_name, positive_label, group_condition):
-    unpriv_group, unpriv_group_pos, priv_group, priv_group_pos = _get_groups(
-        data_pred, label_name, positive_label, group_condition
-    )
-    unpriv_group_prob = len(unpriv_group_pos) / len(unpriv_group)
-    priv_group_prob = len(priv_group_pos) / len(priv_group)
-    return unpriv_group_prob, priv_group_prob
-
-
-def _compute_tpr_fpr(y_true, y_pred, positive_label):
-    TN = 0
-    TP = 0
-    FP = 0
-    FN = 0
-    for i in range(len(y_true)):
-        if y_true[i] == float(positive_label):
-            if y_true[i] == y_pred[i]:
-                TP += 1
-            else:
-                FN += 1
-        else:
-            if y_pred[i] == float(positive_label):
-                FP += 1
-            else:
-                TN += 1
-    if TP + FN == 0:
-        TPR = 0
-    else:
-        TPR = TP / (TP + FN)
-    if FP + TN == 0:
-        FPR = 0
-    else:
-        FPR = FP / (FP + TN)
-    return FPR, TPR
-
-def _compute_fpr_fnr(y_true, y_pred, positive_label):
-    TN = 0
-    TP = 0
-    FP = 0
-    FN = 0
-    for i in range(len(y_true)):
-        if y_true[i] == float(positive_label):
-            if y_true[i] == y_pred[i]:
-                TP += 1
-            else:
-                FN += 1
-        else:
-            if y_pred[i] == float(positive_label):
-                FP += 1
-            else:
-                TN += 1
-    if TP + FN == 0:
-        FNR = 0
-    else:
-        FNR = FN / (TP + FN)
-    if FP + TN == 0:
-        FPR = 0
-    else:
-        FPR = FP / (FP + TN)
-    return FNR, FPR
-
-def _compute_tpr_fpr_groups(data_pred, label, group_condition, positive_label, label_name):
-    query = "&".join([f"{k}=={v}" for k, v in group_condition.items()])
-    unpriv_group = data_pred.query(query)
-    priv_group = data_pred.drop(unpriv_group.index)
-    y_true_unpriv = unpriv_group[label_name].values.ravel()
-    y_pred_unpric = unpriv_group[label].values.ravel()
-    y_true_priv = priv_group[label_name].values.ravel()
-    y_pred_priv = priv_group[label].values.ravel()
-    fpr_unpriv, tpr_unpriv = _compute_tpr_fpr(
-        y_true_unpriv, y_pred_unpric, positive_label
-    )
-    fpr_priv, tpr_priv = _compute_tpr_fpr(y_true_priv, y_pred_priv, positive_label)
+    return mask_fn
+
+
+def _group_mask(data, group_condition):
+    if callable(group_condition):
+        return group_condition(data)
+    return _build_mask_fn(group_condition)(data)
+
+
+def _rates(TP, FN, FP, TN):
+    # (TPR, FPR, FNR) of one group, with a rate of 0 when its denominator is 0
+    positives, negatives = TP + FN, FP + TN
+    TPR = TP / positives if positives != 0 else 0
+    FNR = FN / positives if positives != 0 else 0
+    FPR = FP / negatives if negatives != 0 else 0
+    return TPR, FPR, FNR
+
+
+def _group_confusion_counts(mask, y_true, y_pred, positive_label):
+    pos = float(positive_label)
+    # pack (group, y_true, y_pred) into one key in place, so that a single
+    # bincount gives the full 2x2x2 contingency table, e.g. c[0b111] is TP of
+    # the unprivileged group
+    key = mask.astype(np.uint8)
+    key <<= 1
+    key |= y_true == pos
+    key <<= 1
+    key |= y_pred == pos
+    c = np.bincount(key, minlength=8).tolist()
+    # (TP_u, FN_u, FP_u, TN_u, TP_p, FN_p, FP_p, TN_p)
+    return c[0b111], c[0b110], c[0b101], c[0b100], c[0b011], c[0b010], c[0b001], c[0b000]
+
+
+class GroupMetrics:
+    """
+    Computes group fairness metrics that share one group mask and one set of
+    confusion counts, so that evaluating several of them on the same frame
+    only scans it once. The module-level metric functions delegate to it.
+    Args:
+        data_pred (pd.DataFrame): DataFrame containing the predictions and true labels.
+        group_condition (dict or callable): Dictionary specifying the group
+            condition, or the function built from it by _build_mask_fn.
+        pred_label_name (str): Name of the predicted label column.
+        positive_label: The positive label value.
+        label_name (str): Name of the true label column, only read by the
+            rate based metrics.
+    """
+
+    def __init__(
+        self,
+        data_pred: pd.DataFrame,
+        group_condition: Union[dict, Callable],
+        pred_label_name: str,
+        positive_label,
+        label_name: str = "y_true",
+    ):
+        self.data_pred = data_pred
+        self.mask = _group_mask(data_pred, group_condition)
+        self.y_pred = data_pred[pred_label_name].to_numpy()
+        self.label_name = label_name
+        self.positive_label = positive_label
+        self._counts = None
+
+    def _ensure_counts(self):
+        # (TP_u, FN_u, FP_u, TN_u, TP_p, FN_p, FP_p, TN_p)
+        if self._counts is None:
+            self._counts = _group_confusion_counts(
+                self.mask,
+                self.data_pred[self.label_name].to_numpy(),
+                self.y_pred,
+                self.positive_label,
+            )
+        return self._counts
+
+    def _rates(self):
+        # ((TPR, FPR, FNR) of the unprivileged group, same of the privileged one)
+        counts = self._ensure_counts()
+        return _rates(*counts[:4]), _rates(*counts[4:])
+
+    def _probs(self):
+        # one pass over the packed (group, prediction) key gives all four
+        # group sizes, without needing the true labels
+        key = self.mask.astype(np.uint8)
+        key <<= 1
+        key |= self.y_pred == float(self.positive_label)
+        priv_neg, priv_pos, unpriv_neg, unpriv_pos = np.bincount(key, minlength=4).tolist()
+        unpriv_group_prob = unpriv_pos / (unpriv_neg + unpriv_pos)
+        priv_group_prob = priv_pos / (priv_neg + priv_pos)
+        return unpriv_group_prob, priv_group_prob
+
+    def disparate_impact(self):
+        unpriv_group_prob, priv_group_prob = self._probs()
+        return (
+            min(unpriv_group_prob / priv_group_prob, priv_group_prob / unpriv_group_prob)
+            if unpriv_group_prob != 0 and priv_group_prob != 0
+            else 0
+        )
+
+    def statistical_parity(self):
+        unpriv_group_prob, priv_group_prob = self._probs()
+        return unpriv_group_prob - priv_group_prob
+
+    def average_odds_difference(self):
+        (tpr_unpriv, fpr_unpriv, _), (tpr_priv, fpr_priv, _) = self._rates()
+        return ((tpr_priv - tpr_unpriv) + (fpr_priv - fpr_unpriv)) / 2
+
+    def equalized_odds(self):
+        (tpr_unpriv, _, _), (tpr_priv, _, _) = self._rates()
+        return tpr_unpriv - tpr_priv
+
+    def true_pos_diff(self):
+        (tpr_unpriv, _, _), (tpr_priv, _, _) = self._rates()
+        return tpr_unpriv - tpr_priv
+
+    def false_pos_diff(self):
+        (_, fpr_unpriv, _), (_, fpr_priv, _) = self._rates()
+        return fpr_unpriv - fpr_priv
+
+
+def _compute_tpr_fpr_groups(
+    data_pred, label, group_condition, positive_label, label_name="y_true"
+):
+    (tpr_unpriv, fpr_unpriv, _), (tpr_priv, fpr_priv, _) = GroupMetrics(
+        data_pred, group_condition, label, positive_label, label_name
+    )._rates()
     return fpr_unpriv, tpr_unpriv, fpr_priv, tpr_priv
 
+
 def _compute_fnr_fpr_groups(data_pred, label, group_condition, positive_label):
-    query = "&".join([f"{k}=={v}" for k, v in group_condition.items()])
-    unpriv_group = data_pred.query(query)
-    priv_group = data_pred.drop(unpriv_group.index)
-    y_true_unpriv = unpriv_group["y_true"].values.ravel()
-    y_pred_unpric = unpriv_group[label].values.ravel()
-    y_true_priv = priv_group["y_true"].values.ravel()
-    y_pred_priv = priv_group[label].values.ravel()
-    fnr_unpriv, fpr_unpriv = _compute_fpr_fnr(
-        y_true_unpriv, y_pred_unpric, positive_label
-    )
-    fnr_priv, fpr_priv = _compute_fpr_fnr(y_true_priv, y_pred_priv, positive_label)
+    (_, fpr_unpriv, fnr_unpriv), (_, fpr_priv, fnr_priv) = GroupMetrics(
+        data_pred, group_condition, label, positive_label
+    )._rates()
     return fnr_unpriv, fpr_unpriv, fnr_priv, fpr_priv
 
+
 def disparate_impact(data_pred, group_condition, label_name, positive_label):
     """
     Computes the disparate impact metric.
     Args:
         data_pred (pd.DataFrame): DataFrame containing the predictions and true labels.
-        group_condition (dict): Dictionary specifying the group condition.
+        group_condition (dict or callable): Dictionary specifying the group
+            condition, or the function built from it by _build_mask_fn.
         label_name (str): Name of the predicted label column.
         positive_label: The positive label value.
     Returns:
         float: Disparate impact value.
     """
     
-    unpriv_group_prob, priv_group_prob = _compute_probs(
-        data_pred, label_name, positive_label, group_condition
-    )
-    return (
-        min(unpriv_group_prob / priv_group_prob, priv_group_prob / unpriv_group_prob)
-        if unpriv_group_prob != 0 and priv_group_prob != 0
-        else 0
-    )
+    return GroupMetrics(data_pred, group_condition, label_name, positive_label).disparate_impact()
 
 
 def statistical_parity(
-    data_pred: pd.DataFrame, group_condition: dict, label_name: str, positive_label: str
+    data_pred: pd.DataFrame,
+    group_condition: Union[dict, Callable],
+    label_name: str,
+    positive_label: str,
 ):
     
     """
     Computes the statistical parity metric.
     Args:
         data_pred (pd.DataFrame): DataFrame containing the predictions and true labels.
-        group_condition (dict): Dictionary specifying the group condition.
+        group_condition (dict or callable): Dictionary specifying the group
+            condition, or the function built from it by _build_mask_fn.
         label_name (str): Name of the predicted label column.
         positive_label: The positive label value.
     Returns:
         float: Disparate impact value.
     """
 
-    query = "&".join([f"{k}=={v}" for k, v in group_condition.items()])
-    label_query = label_name + "==" + str(positive_label)
-    unpriv_group_prob = len(data_pred.query(query + "&" + label_query)) / len(
-        data_pred.query(query)
-    )
-    priv_group_prob = len(data_pred.query("~(" + query + ")&" + label_query)) / len(
-        data_pred.query("~(" + query + ")")
-    )
-    return unpriv_group_prob - priv_group_prob
+    return GroupMetrics(
+        data_pred, group_condition, label_name, positive_label
+    ).statistical_parity()
 
 
 def average_odds_difference(
-    data_pred: pd.DataFrame, group_condition: dict, pred_label_name: str, positive_label: str, label_name: str
+    data_pred: pd.DataFrame,
+    group_condition: Union[dict, Callable],
+    pred_label_name: str,
+    positive_label: str,
+    label_name: str,
 ):
-    fpr_unpriv, tpr_unpriv, fpr_priv, tpr_priv = _compute_tpr_fpr_groups(
-        data_pred, pred_label_name, group_condition, positive_label, label_name
-    )
-    return ((tpr_priv - tpr_unpriv) + (fpr_priv - fpr_unpriv)) / 2
+    return GroupMetrics(
+        data_pred, group_condition, pred_label_name, positive_label, label_name
+    ).average_odds_difference()
 
 
 def equalized_odds(
-    data_pred: pd.DataFrame, group_condition: dict, pred_label_name: str, positive_label: str, label_name: str
+    data_pred: pd.DataFrame,
+    group_condition: Union[dict, Callable],
+    pred_label_name: str,
+    positive_label: str,
+    label_name: str,
 ):
-    fpr_unpriv, tpr_unpriv, fpr_priv, tpr_priv = _compute_tpr_fpr_groups(
-        data_pred, pred_label_name, group_condition, positive_label, label_name
-    )
-    return tpr_unpriv - tpr_priv
+    return GroupMetrics(
+        data_pred, group_condition, pred_label_name, positive_label, label_name
+    ).equalized_odds()
 
 
 def true_pos_diff(
-    data_pred: pd.DataFrame, group_condition: str, label: str, positive_label: int
+    data_pred: pd.DataFrame,
+    group_condition: Union[dict, Callable],
+    label: str,
+    positive_label: int,
 ):
-    fpr_unpriv, tpr_unpriv, fpr_priv, tpr_priv = _compute_tpr_fpr_groups(
-        data_pred, label, group_condition, positive_label
-    )
-    return fpr_unpriv - fpr_priv
+    return GroupMetrics(data_pred, group_condition, label, positive_label).true_pos_diff()
 
 
 def false_pos_diff(
-    data_pred: pd.DataFrame, group_condition: str, label: str, positive_label: int
+    data_pred: pd.DataFrame,
+    group_condition: Union[dict, Callable],
+    label: str,
+    positive_label: int,
 ):
-    fpr_unpriv, tpr_unpriv, fpr_priv, tpr_priv = _compute_tpr_fpr_groups(
-        data_pred, label, group_condition, positive_label
-    )
-    return fpr_unpriv - fpr_priv
+    return GroupMetrics(data_pred, group_condition, label, positive_label).false_pos_diff()
 
 
 def zero_one_loss_diff(
@@ -205,46 +259,92 @@ def zero_one_loss_diff(
     return mf.difference()
 
 
+def _yt_yp(df_pred, label, dtype=None):
+    """
+    Extracts the true and predicted labels of a DataFrame as NumPy arrays.
+    Args:
+        df_pred (pd.DataFrame): DataFrame containing the predictions and true labels.
+        label (str): Name of the predicted label column.
+        dtype: Optional dtype to convert the columns to.
+    Returns:
+        tuple: The y_true and y_pred arrays.
+    """
+    return df_pred["y_true"].to_numpy(dtype=dtype), df_pred[label].to_numpy(dtype=dtype)
+
+
 def accuracy(df_pred: pd.DataFrame, label: str):
-    return accuracy_score(df_pred["y_true"].values, df_pred[label].values)
+    y_true, y_pred = _yt_yp(df_pred, label)
+    return accuracy_score(y_true, y_pred)
 
 
 def precision(df_pred: pd.DataFrame, label: str):
-    return precision_score(
-        df_pred["y_true"].values, df_pred[label].values, average="weighted"
-    )
+    y_true, y_pred = _yt_yp(df_pred, label)
+    return precision_score(y_true, y_pred, average="weighted")
 
 
 def recall(df_pred: pd.DataFrame, label: str):
-    return recall_score(
-        df_pred["y_true"].values, df_pred[label].values, average="weighted"
-    )
+    y_true, y_pred = _yt_yp(df_pred, label)
+    return recall_score(y_true, y_pred, average="weighted")
 
 
 def f1(df_pred: pd.DataFrame, label: str):
-    return f1_score(df_pred["y_true"].values, df_pred[label].values, average="weighted")
+    y_true, y_pred = _yt_yp(df_pred, label)
+    return f1_score(y_true, y_pred, average="weighted")
 
 
 def auc(df_pred: pd.DataFrame, label: str):
-    return roc_auc_score(df_pred["y_true"].values, df_pred[label].values)
+    y_true, y_pred = _yt_yp(df_pred, label)
+    return roc_auc_score(y_true, y_pred)
+
+
+def _residuals(df_pred, label):
+    y_true, y_pred = _yt_yp(df_pred, label, dtype=np.float64)
+    return np.subtract(y_true, y_pred)
+
+
+def _mahalanobis(d, cov):
+    if cov is None:
+        raise ValueError("the Mahalanobis distance requires the residual variance cov")
+    # whiten the residuals with the Cholesky factor of cov, cov = L @ L.T,
+    # so that the norm of each solved column is sqrt(r.T @ inv(cov) @ r)
+    d = d.reshape(len(d), -1)
+    L = np.linalg.cholesky(np.atleast_2d(np.asarray(cov, dtype=np.float64)))
+    z = solve_triangular(L, d.T, lower=True)
+    return np.sqrt(np.einsum("ij,ij->j", z, z)).mean()
+
+
+def _all_distances(df_pred, label, cov):
+    """
+    Computes the euclidean, manhattan and mahalanobis distances from a single
+    residual array, for callers that need all three.
+    """
+    d = _residuals(df_pred, label)
+    n = len(df_pred)
+    return np.sqrt(d @ d) / n, np.linalg.norm(d, ord=1) / n, _mahalanobis(d, cov)
 
 
 def euclidean_distance(df_pred, label):
-    return np.linalg.norm(df_pred["y_true"].values - df_pred[label].values) / len(
-        df_pred
-    )
+    d = _residuals(df_pred, label)
+    # the dot product reduces the squares without a temporary array; like the
+    # norm it replaces, it gives NaN rather than an error on an empty frame
+    return np.sqrt(d @ d) / len(df_pred)
 
 
 def manhattan_distance(df_pred, label):
-    return np.sum(np.abs(df_pred["y_true"].values - df_pred[label].values)) / len(
-        df_pred
-    )
+    return np.linalg.norm(_residuals(df_pred, label), ord=1) / len(df_pred)
 
 
-def mahalanobis_distance(df_pred, label):
-    return np.sqrt(
-        np.sum(np.square(df_pred["y_true"].values - df_pred[label].values))
-    ) / len(df_pred)
+def mahalanobis_distance(df_pred, label, cov=None):
+    """
+    Computes the mean Mahalanobis distance between true and predicted labels.
+    Args:
+        df_pred (pd.DataFrame): DataFrame containing the predictions and true labels.
+        label (str): Name of the predicted label column.
+        cov (float): Variance of the residuals y_true - label.
+    Returns:
+        float: Mahalanobis distance value.
+    """
+    return _mahalanobis(_residuals(df_pred, label), cov)
 
 
 def norm_data(data):
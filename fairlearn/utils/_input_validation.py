@@ -1,8 +1,9 @@
 # Copyright (c) Microsoft Corporation and Fairlearn contributors.
 # Licensed under the MIT License.
 
+from __future__ import annotations
+
 import logging
-from typing import Sequence
 
 import numpy as np
 import pandas as pd
@@ -71,7 +72,8 @@ def _validate_and_reformat_input(
     Returns
     -------
     Tuple(numpy.ndarray | pd.DataFrame, pandas.Series, pandas.Series, pandas.Series)
-        The validated and reformatted X, y, sensitive_features and control_features; note
+        The validated and reformatted X, y, sensitive_features and control_features; a
+        DataFrame X is returned as is, but other inputs are converted to arrays. Note
         that certain estimators rely on metadata encoded in X which may be stripped during
         the reformatting process, so mitigation methods should ideally use the input X instead
         of the returned X for training estimators and leave potential reformatting of X to the
@@ -86,13 +88,19 @@ def _validate_and_reformat_input(
             raise ValueError(_MESSAGE_Y_NONE + f", got y={y}.")
         if not (y.ndim == 1 or (y.ndim == 2 and y.shape[1] == 1)):
             raise ValueError(f"`y` must be of shape (n,) or (n,1), got y of shape=({y.shape}).")
-        if enforce_binary_labels and not set(np.unique(y)).issubset(set([0, 1])):
+        y = y.reshape(-1)
+        if enforce_binary_labels and not _labels_are_binary(y):
             raise ValueError(_LABELS_NOT_0_1_ERROR_MESSAGE)
-        y = check_array(y.reshape(-1), ensure_2d=False, dtype="numeric", ensure_all_finite=False)
+        # numeric arrays are already what check_array would return, since
+        # finiteness is not checked and the shape has been validated above
+        if y.dtype.kind not in "fiub":
+            y = check_array(y, ensure_2d=False, dtype="numeric", ensure_all_finite=False)
 
     result_X = check_array(X, dtype=None, ensure_all_finite=False, allow_nd=True)
     if isinstance(X, pd.DataFrame):
-        result_X = pd.DataFrame(result_X)
+        # validation is done, so keep the caller's frame with its columns and dtypes
+        # rather than copying the checked array into a new DataFrame
+        result_X = X
 
     if (y is not None) and y.shape[0] != result_X.shape[0]:
         raise ValueError(_MESSAGE_X_Y_ROWS)
@@ -100,13 +108,19 @@ def _validate_and_reformat_input(
     sensitive_features = kwargs.get(_KW_SENSITIVE_FEATURES)
     if sensitive_features is not None:
         check_consistent_length(X, sensitive_features)
-        sensitive_features = check_array(sensitive_features, ensure_2d=False, dtype=None)
+        column = _as_plain_column(sensitive_features)
+        if column is not None:
+            sensitive_features = column
+        else:
+            sensitive_features = check_array(sensitive_features, ensure_2d=False, dtype=None)
 
         # compress multiple sensitive features into a single column
         if len(sensitive_features.shape) > 1 and sensitive_features.shape[1] > 1:
             sensitive_features = _merge_columns(sensitive_features)
+        elif len(sensitive_features.shape) > 1:
+            sensitive_features = sensitive_features[:, 0]
 
-        sensitive_features = pd.Series(sensitive_features.squeeze())
+        sensitive_features = pd.Series(sensitive_features, copy=False)
     elif expect_sensitive_features:
         raise ValueError(_MESSAGE_SENSITIVE_FEATURES_NONE)
 
@@ -114,13 +128,19 @@ def _validate_and_reformat_input(
     control_features = kwargs.get(_KW_CONTROL_FEATURES)
     if control_features is not None:
         check_consistent_length(X, control_features)
-        control_features = check_array(control_features, ensure_2d=False, dtype=None)
+        column = _as_plain_column(control_features)
+        if column is not None:
+            control_features = column
+        else:
+            control_features = check_array(control_features, ensure_2d=False, dtype=None)
 
         # compress multiple control features into a single column
         if len(control_features.shape) > 1 and control_features.shape[1] > 1:
             control_features = _merge_columns(control_features)
+        elif len(control_features.shape) > 1:
+            control_features = control_features[:, 0]
 
-        control_features = pd.Series(control_features.squeeze())
+        control_features = pd.Series(control_features, copy=False)
 
     # If we don't have a y, then need to fiddle with return type to
     # avoid a warning from pandas
@@ -132,6 +152,41 @@ def _validate_and_reformat_input(
     return (result_X, result_y, sensitive_features, control_features)
 
 
+def _labels_are_binary(y: np.ndarray) -> bool:
+    """Check whether the one-dimensional label array only contains 0 and 1."""
+    # string labels can never compare equal to 0 or 1
+    if y.dtype.kind in "SU":
+        return False
+    # min and max reject most non-binary numeric labels without a full comparison
+    if y.dtype.kind in "fiub" and not (y.min() >= 0 and y.max() <= 1):
+        return False
+    return bool(((y == 0) | (y == 1)).all())
+
+
+def _as_plain_column(features) -> np.ndarray | None:
+    """Return features as a 1D array if :code:`check_array` can be skipped.
+
+    This is the case for arrays and Series with a NumPy boolean, numeric or string
+    dtype that hold a single column of finite values, for which
+    :code:`check_array` would only add overhead. Returns None for any other input,
+    which then needs the full validation.
+    """
+    if not isinstance(features, (np.ndarray, pd.Series)) or not isinstance(
+        features.dtype, np.dtype
+    ):
+        return None
+    if features.dtype.kind not in "biufU":
+        return None
+    if features.ndim == 2 and features.shape[1] == 1:
+        features = features[:, 0]
+    elif features.ndim != 1:
+        return None
+    features = np.asarray(features)
+    if features.dtype.kind == "f" and not np.isfinite(features).all():
+        return None
+    return features
+
+
 def _merge_columns(feature_columns: np.ndarray) -> np.ndarray:
     """Merge multiple columns into a single new column.
 
@@ -156,16 +211,19 @@ def _merge_columns(feature_columns: np.ndarray) -> np.ndarray:
             f"Received argument of type {type(feature_columns).__name__} instead of expected numpy.ndarray"
         )
 
-    def _join_names(names: Sequence[str]) -> str:
-        return _MERGE_COLUMN_SEPARATOR.join(
-            [
-                name
-                # escape backslash and separator
-                .replace("\\", "\\\\").replace(
-                    _MERGE_COLUMN_SEPARATOR, f"\\{_MERGE_COLUMN_SEPARATOR}"
-                )
-                for name in names
-            ]
-        )
-
-    return np.array([_join_names(row) for row in feature_columns.astype(str)])
+    columns = feature_columns.astype(str, copy=False)
+    if columns.ndim == 1:
+        columns = columns[:, np.newaxis]
+    # escape backslash and separator, one whole column at a time, skipping the
+    # replacement when there is nothing to escape
+    for token, escaped in [
+        ("\\", "\\\\"),
+        (_MERGE_COLUMN_SEPARATOR, f"\\{_MERGE_COLUMN_SEPARATOR}"),
+    ]:
+        if (np.char.find(columns, token) >= 0).any():
+            columns = np.char.replace(columns, token, escaped)
+
+    result = columns[:, 0]
+    for j in range(1, columns.shape[1]):
+        result = np.char.add(np.char.add(result, _MERGE_COLUMN_SEPARATOR), columns[:, j])
+    return result
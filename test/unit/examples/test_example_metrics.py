@@ -0,0 +1,205 @@
+# Copyright (c) Fairlearn contributors.
+# Licensed under the MIT License.
+
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import confusion_matrix
+
+_METRICS_PATH = Path(__file__).parents[3] / "examples" / "metrics.py"
+_spec = importlib.util.spec_from_file_location("example_metrics", _METRICS_PATH)
+metrics = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(metrics)
+
+
+@pytest.fixture
+def data_pred():
+    rng = np.random.default_rng(0)
+    n = 500
+    return pd.DataFrame(
+        {
+            "sex": rng.integers(0, 2, n),
+            "race": rng.integers(0, 3, n),
+            "y_true": rng.integers(0, 2, n).astype(float),
+            "pred": rng.integers(0, 2, n).astype(float),
+        }
+    )
+
+
+GROUP_CONDITION = {"sex": 1, "race": 2}
+
+
+def _reference_values(df):
+    # the group metrics from per-group sklearn confusion matrices
+    mask = (df["sex"] == 1).to_numpy() & (df["race"] == 2).to_numpy()
+    rates = []
+    for group in (mask, ~mask):
+        tn, fp, fn, tp = confusion_matrix(
+            df["y_true"][group], df["pred"][group], labels=[0, 1]
+        ).ravel()
+        rates.append((tp / (tp + fn), fp / (fp + tn), (tp + fp) / group.sum()))
+    (tpr_u, fpr_u, sel_u), (tpr_p, fpr_p, sel_p) = rates
+    return {
+        "disparate_impact": min(sel_u / sel_p, sel_p / sel_u),
+        "statistical_parity": sel_u - sel_p,
+        "average_odds_difference": ((tpr_p - tpr_u) + (fpr_p - fpr_u)) / 2,
+        "equalized_odds": tpr_u - tpr_p,
+        "true_pos_diff": tpr_u - tpr_p,
+        "false_pos_diff": fpr_u - fpr_p,
+    }
+
+
+@pytest.mark.parametrize(
+    ("method", "module_value"),
+    [
+        (
+            "disparate_impact",
+            lambda df: metrics.disparate_impact(df, GROUP_CONDITION, "pred", 1),
+        ),
+        (
+            "statistical_parity",
+            lambda df: metrics.statistical_parity(df, GROUP_CONDITION, "pred", 1),
+        ),
+        (
+            "average_odds_difference",
+            lambda df: metrics.average_odds_difference(df, GROUP_CONDITION, "pred", 1, "y_true"),
+        ),
+        (
+            "equalized_odds",
+            lambda df: metrics.equalized_odds(df, GROUP_CONDITION, "pred", 1, "y_true"),
+        ),
+        ("true_pos_diff", lambda df: metrics.true_pos_diff(df, GROUP_CONDITION, "pred", 1)),
+        ("false_pos_diff", lambda df: metrics.false_pos_diff(df, GROUP_CONDITION, "pred", 1)),
+    ],
+)
+def test_group_metrics_match_reference(data_pred, method, module_value):
+    expected = _reference_values(data_pred)[method]
+    group_metrics = metrics.GroupMetrics(data_pred, GROUP_CONDITION, "pred", 1, "y_true")
+
+    assert getattr(group_metrics, method)() == pytest.approx(expected)
+    assert module_value(data_pred) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    ("method", "module_value"),
+    [
+        ("disparate_impact", lambda df, gc: metrics.disparate_impact(df, gc, "pred", 1)),
+        ("statistical_parity", lambda df, gc: metrics.statistical_parity(df, gc, "pred", 1)),
+        (
+            "average_odds_difference",
+            lambda df, gc: metrics.average_odds_difference(df, gc, "pred", 1, "y_true"),
+        ),
+        (
+            "equalized_odds",
+            lambda df, gc: metrics.equalized_odds(df, gc, "pred", 1, "y_true"),
+        ),
+        ("true_pos_diff", lambda df, gc: metrics.true_pos_diff(df, gc, "pred", 1)),
+        ("false_pos_diff", lambda df, gc: metrics.false_pos_diff(df, gc, "pred", 1)),
+    ],
+)
+def test_mask_fn_matches_group_condition(data_pred, method, module_value):
+    mask_fn = metrics._build_mask_fn(GROUP_CONDITION)
+
+    np.testing.assert_array_equal(
+        mask_fn(data_pred), (data_pred["sex"] == 1) & (data_pred["race"] == 2)
+    )
+    assert module_value(data_pred, mask_fn) == module_value(data_pred, GROUP_CONDITION)
+    assert (
+        getattr(metrics.GroupMetrics(data_pred, mask_fn, "pred", 1), method)()
+        == getattr(metrics.GroupMetrics(data_pred, GROUP_CONDITION, "pred", 1), method)()
+    )
+
+
+def test_selection_rate_metrics_do_not_need_true_labels(data_pred):
+    expected = _reference_values(data_pred)
+    data_pred = data_pred.drop(columns="y_true")
+
+    assert metrics.disparate_impact(data_pred, GROUP_CONDITION, "pred", 1) == pytest.approx(
+        expected["disparate_impact"]
+    )
+    assert metrics.statistical_parity(data_pred, GROUP_CONDITION, "pred", 1) == pytest.approx(
+        expected["statistical_parity"]
+    )
+
+
+def test_mahalanobis_distance(data_pred):
+    s = 0.5
+    residuals = data_pred["y_true"].to_numpy() - data_pred["pred"].to_numpy()
+
+    assert metrics.mahalanobis_distance(data_pred, "pred", cov=s**2) == pytest.approx(
+        np.mean(np.abs(residuals)) / s
+    )
+    assert metrics._all_distances(data_pred, "pred", s**2)[2] == pytest.approx(
+        np.mean(np.abs(residuals)) / s
+    )
+
+
+def test_mahalanobis_distance_requires_cov(data_pred):
+    with pytest.raises(ValueError, match="residual variance cov"):
+        metrics.mahalanobis_distance(data_pred, "pred")
+    with pytest.raises(ValueError, match="residual variance cov"):
+        metrics._all_distances(data_pred, "pred", None)
+
+
+@pytest.mark.parametrize("distance", ["euclidean_distance", "manhattan_distance"])
+def test_distance_of_empty_frame_is_nan(data_pred, distance):
+    with pytest.warns(RuntimeWarning):
+        assert np.isnan(getattr(metrics, distance)(data_pred.iloc[:0], "pred"))
+
+
+@pytest.mark.parametrize(
+    ("counts", "expected"),
+    [
+        ((3, 1, 2, 6), (0.75, 0.25, 0.25)),
+        ((0, 0, 2, 6), (0, 0.25, 0)),
+        ((3, 1, 0, 0), (0.75, 0, 0.25)),
+    ],
+)
+def test_rates(counts, expected):
+    assert metrics._rates(*counts) == pytest.approx(expected)
+
+
+def test_group_confusion_counts_matches_confusion_matrix(data_pred):
+    mask = metrics._group_mask(data_pred, GROUP_CONDITION)
+    y_true = data_pred["y_true"].to_numpy()
+    y_pred = data_pred["pred"].to_numpy()
+
+    expected = []
+    for group in [mask, ~mask]:
+        tn, fp, fn, tp = confusion_matrix(y_true[group], y_pred[group], labels=[0, 1]).ravel()
+        expected.extend([tp, fn, fp, tn])
+
+    assert metrics._group_confusion_counts(mask, y_true, y_pred, 1) == tuple(expected)
+
+
+@pytest.fixture
+def small_data_pred():
+    # unprivileged (g == 1): TP=1, FN=1, FP=2, TN=0
+    # privileged (g == 0):   TP=2, FN=0, FP=0, TN=2
+    return pd.DataFrame(
+        {
+            "g": [1, 1, 1, 1, 0, 0, 0, 0],
+            "y_true": [1.0, 1.0, 0.0, 0.0, 1.0, 1.0, 0.0, 0.0],
+            "pred": [1.0, 0.0, 1.0, 1.0, 1.0, 1.0, 0.0, 0.0],
+        }
+    )
+
+
+def test_group_rates_hand_counted(small_data_pred):
+    group_condition = {"g": 1}
+
+    assert metrics._compute_tpr_fpr_groups(small_data_pred, "pred", group_condition, 1) == (
+        pytest.approx((1.0, 0.5, 0.0, 1.0))
+    )
+    assert metrics._compute_fnr_fpr_groups(small_data_pred, "pred", group_condition, 1) == (
+        pytest.approx((0.5, 1.0, 0.0, 0.0))
+    )
+    assert metrics.true_pos_diff(small_data_pred, group_condition, "pred", 1) == pytest.approx(
+        -0.5
+    )
+    assert metrics.false_pos_diff(small_data_pred, group_condition, "pred", 1) == pytest.approx(
+        1.0
+    )
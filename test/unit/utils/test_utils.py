@@ -23,6 +23,7 @@ class TestValidateAndReformatInput:
         assert cf_update is None
 
         assert isinstance(X_update, pd.DataFrame)
+        assert X_update is X
         assert np.array_equal(X, X_update)
         assert np.array_equal(y, y_update)
         assert np.array_equal(sf, sf_update)
@@ -68,6 +69,9 @@ def test_validate_and_reformat_input_allow_ndims_greater_than_2() -> None:
     ("input_data", "expected"),
     [
         (np.array([["A", "B"], ["C", "D"]]), np.array(["A,B", "C,D"])),
+        (np.array([[1, 2], [3, 4]]), np.array(["1,2", "3,4"])),
+        (np.array([["A,B"], ["C"]]), np.array(["A\\,B", "C"])),
+        (np.array(["A\\B", "C"]), np.array(["A\\\\B", "C"])),
         (
             np.array(
                 [
@@ -110,3 +114,85 @@ def test_validate_and_reformat_input_empty_y(y):
         X, y, _, _ = iv._validate_and_reformat_input(
             X=X, y=y, expect_y=True, expect_sensitive_features=False
         )
+
+
+@pytest.mark.parametrize(
+    "sf",
+    [
+        np.asarray([1, 2, 1]),
+        np.asarray(["a", "b", "a"]),
+        np.asarray([True, False, True]),
+        np.asarray([0.5, 1.5, 0.5]),
+        np.asarray([[1], [2], [1]]),
+        pd.Series([1, 2, 1], index=[5, 6, 7]),
+    ],
+)
+def test_validate_and_reformat_input_plain_sensitive_features(sf):
+    X = np.asarray([[0], [1], [2]])
+
+    _, _, sf_update, _ = iv._validate_and_reformat_input(
+        X=X, sensitive_features=sf, expect_y=False
+    )
+
+    assert isinstance(sf_update, pd.Series)
+    assert sf_update.index.equals(pd.RangeIndex(3))
+    np.testing.assert_array_equal(sf_update, np.asarray(sf).reshape(-1))
+
+
+@pytest.mark.parametrize(
+    ("sf", "match"),
+    [
+        (np.asarray([1.0, np.nan, 1.0]), "NaN"),
+        (np.asarray([[1.0], [np.inf], [1.0]]), "infinity"),
+    ],
+)
+def test_validate_and_reformat_input_sensitive_features_not_finite(sf, match):
+    X = np.asarray([[0], [1], [2]])
+
+    with pytest.raises(ValueError, match=match):
+        iv._validate_and_reformat_input(X=X, sensitive_features=sf, expect_y=False)
+
+
+@pytest.mark.parametrize(
+    "y",
+    [
+        [0, 1, 2],
+        [0.0, 0.5, 1.0],
+        [0.0, np.nan, 1.0],
+        ["0", "1", "1"],
+        np.asarray([0, "1", 1], dtype=object),
+    ],
+)
+def test_validate_and_reformat_input_enforce_binary_labels_raises(y):
+    X = np.asarray([[0], [1], [2]])
+
+    with pytest.raises(ValueError, match=iv._LABELS_NOT_0_1_ERROR_MESSAGE):
+        iv._validate_and_reformat_input(
+            X=X, y=y, enforce_binary_labels=True, expect_sensitive_features=False
+        )
+
+
+@pytest.mark.parametrize(
+    "y",
+    [[0, 1, 1], [0.0, 1.0, 0.0], [True, False, True], np.asarray([[0], [1], [1]])],
+)
+def test_validate_and_reformat_input_enforce_binary_labels(y):
+    X = np.asarray([[0], [1], [2]])
+
+    _, y_update, _, _ = iv._validate_and_reformat_input(
+        X=X, y=y, enforce_binary_labels=True, expect_sensitive_features=False
+    )
+
+    np.testing.assert_array_equal(y_update, np.asarray(y).reshape(-1))
+
+
+@pytest.mark.parametrize("sf", [np.asarray([1, 2, 1]), np.asarray([[1.5], [2.5], [1.5]])])
+def test_validate_and_reformat_input_sensitive_features_not_copied(sf):
+    X = np.asarray([[0], [1], [2]])
+
+    _, _, sf_update, cf_update = iv._validate_and_reformat_input(
+        X=X, sensitive_features=sf, control_features=sf, expect_y=False
+    )
+
+    assert np.shares_memory(sf_update.to_numpy(), sf)
+    assert np.shares_memory(cf_update.to_numpy(), sf)